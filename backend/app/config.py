@@ -30,6 +30,16 @@ class Settings(BaseSettings):
     log_level: str = "INFO"
     environment: str = "development"
 
+    # Embedding Settings
+    device: str = ""  # Inference device ("cuda"/"cpu"); empty = auto-detect
+    torch_num_threads: int = 0  # Intra-op threads for PyTorch inference (0 = all cores)
+    use_onnx_embeddings: bool = False  # Export the embedding model to ONNX Runtime (2-4x faster on CPU, requires optimum[onnxruntime])
+    quantize_reranker: bool = False  # int8 dynamic quantization of the cross-encoder (~2x faster on CPU, skip on GPU)
+    quantize_vectors: bool = False  # int8 scalar quantization of vectors sent to Pinecone (~1% recall loss, smaller payloads)
+
+    # Vector Store Settings
+    pinecone_pool_threads: int = 30  # Connection pool size for the Pinecone index client
+
     # Retrieval Settings
     top_k_initial_retrieval: int = 100  # Increased to handle typos/format issues - more candidates
     top_k_after_reranking: int = 10  # Increased to give LLM more context for better matching
@@ -1,5 +1,6 @@
 """Evaluation suite using Logfire for answer quality."""
 
+import asyncio
 import logging
 from datetime import datetime
 from typing import List
@@ -52,7 +53,7 @@ class EvaluationEngine:
         self.llm_service = get_llm_service()
 
     @optional_instrument("evaluate_answer_quality")
-    def evaluate(
+    async def evaluate(
         self,
         question: str,
         answer: str,
@@ -71,30 +72,23 @@ class EvaluationEngine:
         """
         logger.info(f"Running evaluations for answer: {answer[:50]}...")
 
-        evaluations = []
+        # The four LLM-judged evaluations are independent I/O-bound API calls -
+        # run them concurrently so the stage costs max(call) instead of sum(calls)
+        logger.debug("Running LLM-judged evaluations concurrently")
+        relevance, groundedness, context_relevance, entity_accuracy = await asyncio.gather(
+            self._evaluate_answer_relevance(question, answer),
+            self._evaluate_groundedness(question, answer, contexts),
+            self._evaluate_context_relevance(question, contexts),
+            self._evaluate_entity_accuracy(answer, contexts),
+        )
 
-        # Run each evaluation
-        logger.debug("Running answer_relevance evaluation")
-        relevance = self._evaluate_answer_relevance(question, answer)
-        evaluations.append(relevance)
+        evaluations = [relevance, groundedness, context_relevance, entity_accuracy]
         logfire_log(f"Answer relevance score: {relevance.score}", metadata=relevance.dict())
-
-        logger.debug("Running groundedness evaluation")
-        groundedness = self._evaluate_groundedness(question, answer, contexts)
-        evaluations.append(groundedness)
         logfire_log(f"Groundedness score: {groundedness.score}", metadata=groundedness.dict())
-
-        logger.debug("Running context_relevance evaluation")
-        context_relevance = self._evaluate_context_relevance(question, contexts)
-        evaluations.append(context_relevance)
         logfire_log(
             f"Context relevance score: {context_relevance.score}",
             metadata=context_relevance.dict(),
         )
-
-        logger.debug("Running entity_accuracy evaluation")
-        entity_accuracy = self._evaluate_entity_accuracy(answer, contexts)
-        evaluations.append(entity_accuracy)
         logfire_log(f"Entity accuracy score: {entity_accuracy.score}", metadata=entity_accuracy.dict())
 
         logger.debug("Running answer_completeness evaluation")
@@ -126,7 +120,7 @@ class EvaluationEngine:
 
         return results
 
-    def _evaluate_answer_relevance(self, question: str, answer: str) -> EvaluationScore:
+    async def _evaluate_answer_relevance(self, question: str, answer: str) -> EvaluationScore:
         """Evaluate if answer addresses the question."""
         logger.debug("Evaluating answer relevance")
 
@@ -141,7 +135,7 @@ Respond with only: SCORE: <number>, REASONING: <brief reason>"""
 
         try:
             system_prompt = "You are an evaluation assistant. Provide scores and reasoning based on the given criteria."
-            result = self.llm_service.raw_call(system_prompt, prompt, temperature=0.1, max_tokens=200)
+            result = await self.llm_service.araw_call(system_prompt, prompt, temperature=0.1, max_tokens=200)
             score, reasoning = self._parse_evaluation_response(result)
 
             passed = score >= 0.7
@@ -162,7 +156,7 @@ Respond with only: SCORE: <number>, REASONING: <brief reason>"""
                 passed=False,
             )
 
-    def _evaluate_groundedness(
+    async def _evaluate_groundedness(
         self,
         question: str,
         answer: str,
@@ -186,7 +180,7 @@ Respond with only: SCORE: <number>, REASONING: <brief reason>"""
 
         try:
             system_prompt = "You are an evaluation assistant. Provide scores and reasoning based on the given criteria."
-            result = self.llm_service.raw_call(system_prompt, prompt, temperature=0.1, max_tokens=200)
+            result = await self.llm_service.araw_call(system_prompt, prompt, temperature=0.1, max_tokens=200)
             score, reasoning = self._parse_evaluation_response(result)
 
             passed = score >= 0.8
@@ -207,7 +201,7 @@ Respond with only: SCORE: <number>, REASONING: <brief reason>"""
                 passed=False,
             )
 
-    def _evaluate_context_relevance(
+    async def _evaluate_context_relevance(
         self,
         question: str,
         contexts: List[RetrievedContext],
@@ -229,7 +223,7 @@ Respond with only: SCORE: <number>, REASONING: <brief reason>"""
 
         try:
             system_prompt = "You are an evaluation assistant. Provide scores and reasoning based on the given criteria."
-            result = self.llm_service.raw_call(system_prompt, prompt, temperature=0.1, max_tokens=200)
+            result = await self.llm_service.araw_call(system_prompt, prompt, temperature=0.1, max_tokens=200)
             score, reasoning = self._parse_evaluation_response(result)
 
             passed = score >= 0.7
@@ -250,7 +244,7 @@ Respond with only: SCORE: <number>, REASONING: <brief reason>"""
                 passed=False,
             )
 
-    def _evaluate_entity_accuracy(
+    async def _evaluate_entity_accuracy(
         self,
         answer: str,
         contexts: List[RetrievedContext],
@@ -273,7 +267,7 @@ Respond with only: SCORE: <number>, REASONING: <brief reason>"""
 
         try:
             system_prompt = "You are an evaluation assistant. Provide scores and reasoning based on the given criteria."
-            result = self.llm_service.raw_call(system_prompt, prompt, temperature=0.1, max_tokens=200)
+            result = await self.llm_service.araw_call(system_prompt, prompt, temperature=0.1, max_tokens=200)
             score, reasoning = self._parse_evaluation_response(result)
 
             passed = score >= 0.9
@@ -1,7 +1,8 @@
 """LLM service using OpenRouter and GPT-4o mini."""
 
 import logging
-from typing import List, Optional, Tuple
+import threading
+from typing import Iterator, List, Optional, Tuple
 import openai
 from .models import RetrievedContext
 from .config import get_settings
@@ -25,38 +26,25 @@ class LLMService:
             base_url="https://openrouter.ai/api/v1",
         )
 
-        self.model = settings.openrouter_model
-        logger.info(f"LLMService initialized with model: {self.model}")
-
-    def generate_answer(
-        self,
-        question: str,
-        contexts: List[RetrievedContext],
-    ) -> Tuple[str, TokenUsage]:
-        """
-        Generate an answer to a question using retrieved contexts.
-
-        Args:
-            question: The question being asked
-            contexts: List of retrieved and reranked contexts
-
-        Returns:
-            Tuple of (answer string, TokenUsage object)
-        """
-        logger.info(f"Generating answer for question: {question[:50]}...")
-        logger.debug(f"Using {len(contexts)} contexts")
+        # Async client for concurrent calls (evaluations fire several
+        # independent judgements per answer)
+        self.aclient = openai.AsyncOpenAI(
+            api_key=settings.openrouter_api_key,
+            base_url="https://openrouter.ai/api/v1",
+        )
 
-        # Format contexts
-        context_text = self._format_contexts(contexts)
+        self.model = settings.openrouter_model
 
-        # Build prompt
-        system_prompt = """You are a helpful assistant that answers questions about member data 
+        # The system prompt is constant across calls - build it once. A
+        # byte-identical prompt prefix also keeps provider-side prompt
+        # caching effective where OpenRouter supports it.
+        self._system_prompt = """You are a helpful assistant that answers questions about member data
 from message conversations. Use ONLY the provided context to answer questions accurately and concisely.
 
 IMPORTANT - User-Message Mapping:
-- When a question asks about a specific person (e.g., "What did Sophia say?", "Summarize Fatima's messages"), 
+- When a question asks about a specific person (e.g., "What did Sophia say?", "Summarize Fatima's messages"),
   focus ONLY on messages from that person based on the user names in brackets [Name] in the context.
-- When a question asks "Who said X?" or "Which user mentioned Y?", identify the user name from the brackets [Name] 
+- When a question asks "Who said X?" or "Which user mentioned Y?", identify the user name from the brackets [Name]
   in the context that corresponds to the relevant message.
 - When a question asks about multiple users (e.g., "Compare Fatima and Vikram"), provide information about each user separately.
 - User names may have variations or typos in the question - match them semantically to the names in brackets.
@@ -71,6 +59,25 @@ IMPORTANT - Answer Format:
 If the answer cannot be found in the context, clearly state that you don't have that information.
 Do not make assumptions or provide information not in the context."""
 
+        logger.info(f"LLMService initialized with model: {self.model}")
+
+    def _build_prompts(
+        self,
+        question: str,
+        contexts: List[RetrievedContext],
+    ) -> Tuple[str, str]:
+        """
+        Build the (system, user) prompt pair for answer generation.
+
+        Args:
+            question: The question being asked
+            contexts: List of retrieved and reranked contexts
+
+        Returns:
+            Tuple of (system prompt, user prompt)
+        """
+        context_text = self._format_contexts(contexts)
+
         user_prompt = f"""Context from member messages:
 {context_text}
 
@@ -78,6 +85,28 @@ Question: {question}
 
 Answer: Based on the context above, provide a clear and concise answer. If information is not available, say so."""
 
+        return self._system_prompt, user_prompt
+
+    def generate_answer(
+        self,
+        question: str,
+        contexts: List[RetrievedContext],
+    ) -> Tuple[str, TokenUsage]:
+        """
+        Generate an answer to a question using retrieved contexts.
+
+        Args:
+            question: The question being asked
+            contexts: List of retrieved and reranked contexts
+
+        Returns:
+            Tuple of (answer string, TokenUsage object)
+        """
+        logger.info(f"Generating answer for question: {question[:50]}...")
+        logger.debug(f"Using {len(contexts)} contexts")
+
+        system_prompt, user_prompt = self._build_prompts(question, contexts)
+
         try:
             logger.debug(f"Calling OpenRouter API with model: {self.model}")
 
@@ -123,6 +152,73 @@ Answer: Based on the context above, provide a clear and concise answer. If infor
             logger.error(f"Failed to generate answer: {e}")
             raise
 
+    def generate_answer_stream(
+        self,
+        question: str,
+        contexts: List[RetrievedContext],
+    ) -> Iterator[str]:
+        """
+        Generate an answer as a stream of text deltas.
+
+        Total generation time is unchanged, but callers see the first token
+        after one model step instead of waiting for the full completion -
+        time-to-first-token drops by an order of magnitude on long answers.
+
+        Args:
+            question: The question being asked
+            contexts: List of retrieved and reranked contexts
+
+        Yields:
+            Text deltas as they arrive from the model
+        """
+        logger.info(f"Streaming answer for question: {question[:50]}...")
+        logger.debug(f"Using {len(contexts)} contexts")
+
+        system_prompt, user_prompt = self._build_prompts(question, contexts)
+
+        try:
+            stream = self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+                temperature=0.1,  # Low temperature for factual answers
+                max_tokens=500,
+                stream=True,
+                stream_options={"include_usage": True},  # usage arrives on the final chunk
+            )
+
+            total_chars = 0
+            usage_chunk = None
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta and chunk.choices[0].delta.content:
+                    delta = chunk.choices[0].delta.content
+                    total_chars += len(delta)
+                    yield delta
+                if getattr(chunk, "usage", None):
+                    usage_chunk = chunk
+
+            # Log token usage from the final chunk (not part of the stream payload)
+            if usage_chunk:
+                token_usage = TokenUtils.extract_usage_from_response(usage_chunk)
+                if token_usage:
+                    token_usage.cost_usd = TokenUtils.calculate_cost(
+                        token_usage.prompt_tokens,
+                        token_usage.completion_tokens,
+                        self.model
+                    )
+                    logger.info(
+                        f"Token usage: {token_usage.total_tokens} tokens "
+                        f"Cost: {TokenUtils.format_cost(token_usage.cost_usd)}"
+                    )
+
+            logger.info(f"Streamed answer complete ({total_chars} chars)")
+
+        except Exception as e:
+            logger.error(f"Failed to stream answer: {e}")
+            raise
+
     def raw_call(self, system_prompt: str, user_prompt: str, temperature: float = 0.1, max_tokens: int = 200) -> str:
         """
         Make a raw LLM call (for evaluations).
@@ -165,39 +261,79 @@ Answer: Based on the context above, provide a clear and concise answer. If infor
             logger.error(f"Raw LLM call failed: {e}")
             raise
 
-    def _format_contexts(self, contexts: List[RetrievedContext]) -> str:
+    async def araw_call(self, system_prompt: str, user_prompt: str, temperature: float = 0.1, max_tokens: int = 200) -> str:
         """
-        Format retrieved contexts for the LLM prompt.
+        Make a raw async LLM call (for concurrent evaluations).
 
         Args:
-            contexts: List of contexts
+            system_prompt: System prompt
+            user_prompt: User prompt
+            temperature: Temperature for generation
+            max_tokens: Max tokens to generate
 
         Returns:
-            Formatted context string
+            Generated text
         """
-        formatted = []
+        try:
+            response = await self.aclient.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+
+            # Log token usage for evaluations (but don't return it)
+            token_usage = TokenUtils.extract_usage_from_response(response)
+            if token_usage:
+                token_usage.cost_usd = TokenUtils.calculate_cost(
+                    token_usage.prompt_tokens,
+                    token_usage.completion_tokens,
+                    self.model
+                )
+                logger.debug(
+                    f"Evaluation call tokens: {token_usage.total_tokens} "
+                    f"Cost: {TokenUtils.format_cost(token_usage.cost_usd)}"
+                )
 
-        for ctx in contexts:
-            msg = ctx.message
-            formatted_item = f"- [{msg.user_name}] {msg.message}"
+            return response.choices[0].message.content.strip()
+        except Exception as e:
+            logger.error(f"Raw async LLM call failed: {e}")
+            raise
 
-            if ctx.reranker_score is not None:
-                formatted_item += f" (relevance: {ctx.reranker_score:.2f})"
+    def _format_contexts(self, contexts: List[RetrievedContext]) -> str:
+        """
+        Format retrieved contexts for the LLM prompt.
 
-            formatted.append(formatted_item)
+        Args:
+            contexts: List of contexts
 
-        return "\n".join(formatted)
+        Returns:
+            Formatted context string
+        """
+        # Single join over a generator - one final allocation instead of
+        # per-context intermediate strings and append calls
+        return "\n".join(
+            f"- [{ctx.message.user_name}] {ctx.message.message}"
+            + (f" (relevance: {ctx.reranker_score:.2f})" if ctx.reranker_score is not None else "")
+            for ctx in contexts
+        )
 
 
 # Global LLM service instance
 _llm_service = None
+_llm_service_lock = threading.Lock()
 
 
 def get_llm_service() -> LLMService:
-    """Get or create the LLM service."""
+    """Get or create the LLM service (thread-safe)."""
     global _llm_service
     if _llm_service is None:
-        logger.info("Creating new LLMService instance")
-        _llm_service = LLMService()
+        with _llm_service_lock:
+            if _llm_service is None:
+                logger.info("Creating new LLMService instance")
+                _llm_service = LLMService()
     return _llm_service
 
@@ -1,5 +1,6 @@
 """Pydantic models for the QA system."""
 
+from dataclasses import dataclass
 from typing import List, Optional
 from datetime import datetime
 from pydantic import BaseModel, Field
@@ -123,7 +124,15 @@ class IndexingStatusResponse(BaseModel):
 # ============================================================================
 
 
-class Message(BaseModel):
+# Message and RetrievedContext are constructed in bulk on the search hot path
+# (one each per retrieved match). Slotted dataclasses keep them lean: no
+# per-instance __dict__, cheaper construction and attribute access than
+# dict-backed models. They never cross the API boundary, so they don't need
+# Pydantic validation or serialization.
+
+
+@dataclass(slots=True)
+class Message:
     """Message data model."""
 
     id: str
@@ -140,13 +149,14 @@ class PaginatedMessages(BaseModel):
     items: List[Message]
 
 
-class RetrievedContext(BaseModel):
+@dataclass(slots=True)
+class RetrievedContext:
     """Retrieved context with metadata."""
 
     message: Message
     similarity_score: float
-    reranker_score: Optional[float] = None
     rank: int
+    reranker_score: Optional[float] = None
 
 
 class IndexingMetadata(BaseModel):
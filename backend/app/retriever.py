@@ -1,8 +1,13 @@
 """Orchestration for the Q&A retrieval pipeline."""
 
+import asyncio
+import difflib
+import functools
 import logging
+import re
 import time
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
 from datetime import datetime
 import numpy as np
 from .models import (
@@ -30,19 +35,38 @@ class QARetriever:
         """Initialize the retriever."""
         settings = get_settings()
 
-        self.embeddings_client = get_embeddings_client()
-        self.vector_store = get_vector_store()
-        self.reranker = get_reranker()
-        self.llm_service = get_llm_service()
+        # Load the heavy components in parallel - the embedding model (~2GB)
+        # and cross-encoder (~300MB) are independent disk/mmap-bound loads, so
+        # cold start costs roughly max(load) instead of the sum
+        with ThreadPoolExecutor(max_workers=4, thread_name_prefix="qa-init") as init_pool:
+            embeddings_future = init_pool.submit(get_embeddings_client)
+            vector_store_future = init_pool.submit(get_vector_store)
+            reranker_future = init_pool.submit(get_reranker)
+            llm_future = init_pool.submit(get_llm_service)
+
+            self.embeddings_client = embeddings_future.result()
+            self.vector_store = vector_store_future.result()
+            self.reranker = reranker_future.result()
+            self.llm_service = llm_future.result()
+
         self.evaluation_engine = get_evaluation_engine()
         self.query_analyzer = get_query_analyzer()
 
         self.top_k_initial = settings.top_k_initial_retrieval
         self.top_k_final = settings.top_k_after_reranking
 
+        # Dedicated pool for the CPU-bound pipeline stages (embed, rerank) and
+        # blocking network calls - PyTorch releases the GIL inside its ops, so
+        # running them here keeps the event loop free and lets independent
+        # stages overlap
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="qa-pipeline")
+
         # Cache for ALL user name embeddings (full names only - no need for separate first names)
+        # Stored as one L2-normalized (N, 1024) float32 matrix so matching a
+        # query against every name is a single BLAS matmul, not a Python loop
         # Initialized lazily on first query to avoid blocking startup
-        self._user_name_embeddings_cache = {}  # {user_name: embedding}
+        self._user_name_list = []  # Row i of the matrix is user_name_list[i]
+        self._user_name_matrix = None  # (N, 1024) float32, rows unit-length
         self._all_user_names = set()  # All known user names
         self._cache_initialized = False  # Track if cache has been initialized
 
@@ -76,13 +100,252 @@ class QARetriever:
         user_names_list = list(all_user_names)
         logger.info(f"Embedding {len(user_names_list)} full user names...")
         full_name_embeddings = self.embeddings_client.embed_texts(user_names_list)
+
+        # Normalize rows once so cosine similarity is just a dot product
+        norms = np.linalg.norm(full_name_embeddings, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        self._user_name_matrix = np.ascontiguousarray(
+            full_name_embeddings / norms, dtype=np.float32
+        )
+        self._user_name_list = user_names_list
+
+        self._cache_initialized = True
+        logger.info(f"User name cache initialized: {len(self._user_name_list)} full names cached")
+
+    def _fuzzy_match_users(self, question: str) -> List[str]:
+        """
+        Fuzzy-match capitalized query words against known user names.
+
+        Catches typos that defeat semantic matching ("Thaigo" for "Thiago",
+        "Fatimah" for "Fatima") so those queries still reach the
+        metadata-filtered search path instead of scanning the full corpus.
+
+        Args:
+            question: The raw question text
+
+        Returns:
+            List of matched full user names
+        """
+        if not self._all_user_names:
+            return []
+
+        # Map lowercase first names back to full names
+        first_names = {}
+        for full_name in self._all_user_names:
+            parts = full_name.split()
+            if parts:
+                first_names.setdefault(parts[0].lower(), full_name)
+
+        matched = []
+        for word in re.findall(r"\b[A-Z][a-z]+", question):
+            close = difflib.get_close_matches(word.lower(), first_names.keys(), n=1, cutoff=0.8)
+            if close:
+                full_name = first_names[close[0]]
+                if full_name not in matched:
+                    matched.append(full_name)
+                    logger.debug(f"Fuzzy-matched '{word}' to user '{full_name}'")
+        return matched
+
+    async def _run_blocking(self, func, *args, **kwargs):
+        """Run a blocking pipeline stage on the dedicated executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def _retrieve_contexts(
+        self, request: QuestionRequest
+    ) -> Tuple[List[RetrievedContext], List[str]]:
+        """
+        Run the retrieval stages of the pipeline: embed the question,
+        retrieve candidates (expanding user-specific queries), and rerank.
+
+        Shared by the full answer pipeline and the streaming path, so both
+        produce identical context sets.
+
+        Args:
+            request: Question request
+
+        Returns:
+            Tuple of (reranked contexts, semantically detected user names)
+        """
+        # Step 1: Embed question (pure semantic understanding - no regex/pattern matching)
+        # Normalized float32 buffer streams straight into the vector store
+        # (cosine metric, so normalization doesn't change the ranking)
+        logger.info("[1/5] Embedding question")
+        question_embedding = await self._run_blocking(
+            self.embeddings_client.embed_single_normalized, request.question
+        )
+        logger.debug(f"Question embedding generated ({len(question_embedding)} dims)")
+
+        # Step 2: Retrieve initial candidates to detect user-specific queries
+        # Kick off the network search and, on the first query, overlap the
+        # user name cache build with it instead of running them back to back
+        logger.info(f"[2/5] Retrieving top-{self.top_k_initial} messages for initial analysis")
+        search_task = asyncio.ensure_future(
+            self._run_blocking(self.vector_store.search, question_embedding, top_k=self.top_k_initial)
+        )
+        if not self._cache_initialized:
+            await asyncio.gather(
+                search_task, self._run_blocking(self._initialize_user_name_cache)
+            )
+        initial_contexts = await search_task
+        logger.info(f"Retrieved {len(initial_contexts)} messages")
+
+        # Analyze user distribution to detect user-specific queries
+        user_counts = {}
+        for ctx in initial_contexts:
+            user_name = ctx.message.user_name
+            user_counts[user_name] = user_counts.get(user_name, 0) + 1
+        logger.info(f"User distribution in top-{self.top_k_initial}: {dict(sorted(user_counts.items(), key=lambda x: x[1], reverse=True)[:10])}")
+
+        # Detect if this is a user-specific or multi-user query
+        # Use SEMANTIC matching with CACHED embeddings (no embedding on each query!)
+        query_lower = request.question.lower()
+        mentioned_users = []
         
-        # Cache full name embeddings
-        for user_name, emb in zip(user_names_list, full_name_embeddings):
-            self._user_name_embeddings_cache[user_name] = emb
+        # Use cached full name embeddings for semantic matching
+        # Semantic similarity naturally handles matching "Sophia" (query) to "Sophia Al-Farsi" (full name)
+        logger.debug(f"Checking {len(self._user_name_list)} cached full names for semantic match")
+
+        # Compare query with ALL cached full name embeddings in one matmul
+        # (query and name rows are both unit-length, so dot == cosine)
+        user_similarities = []
+        if self._user_name_matrix is not None and len(self._user_name_list) > 0:
+            similarities = self._user_name_matrix @ question_embedding
+            user_similarities = list(zip(self._user_name_list, similarities))
+
+        # Sort by similarity and use a dynamic threshold
+        # Take top-N users with highest similarity, but only if similarity is above a minimum threshold
+        user_similarities.sort(key=lambda x: x[1], reverse=True)
         
-        self._cache_initialized = True
-        logger.info(f"User name cache initialized: {len(self._user_name_embeddings_cache)} full names cached")
+        # Dynamic threshold: Use top similarity as reference, accept users within 0.2 of top score
+        # This ensures we only get users that are actually mentioned, not all users
+        if user_similarities:
+            top_similarity = user_similarities[0][1]
+            # Threshold: Must be within 0.2 of top score AND above 0.5 absolute threshold
+            min_threshold = max(0.5, top_similarity - 0.2)
+            
+            for user_name, similarity in user_similarities:
+                if similarity >= min_threshold:
+                    if user_name not in mentioned_users:
+                        mentioned_users.append(user_name)
+                        logger.debug(f"Semantically matched user '{user_name}' (similarity: {similarity:.3f}, threshold: {min_threshold:.3f})")
+                else:
+                    # Stop once we're below threshold (sorted by similarity, so rest will be lower)
+                    break
+        
+        logger.info(f"Semantically detected {len(mentioned_users)} users in query: {mentioned_users}")
+
+        # Typo fallback: if semantic matching found nothing, fuzzy-match
+        # capitalized query words against the known names so misspellings
+        # still get the filtered (user-scoped) retrieval path
+        if not mentioned_users:
+            fuzzy_users = self._fuzzy_match_users(request.question)
+            if fuzzy_users:
+                mentioned_users = fuzzy_users
+                logger.info(f"Fuzzy-matched {len(fuzzy_users)} users in query: {fuzzy_users}")
+
+
+        # Check if query seems user-specific (contains words like "summarize", "messages", "said", etc.)
+        user_specific_keywords = ["summarize", "summarise", "messages", "said", "say", "request", "requests", "asked", "ask", "visited", "visit", "places", "travel"]
+        is_user_specific_query = any(keyword in query_lower for keyword in user_specific_keywords)
+        
+        dominant_user = None
+        target_users = []
+        
+        if mentioned_users and is_user_specific_query:
+            if len(mentioned_users) == 1:
+                # Single user query - retrieve ALL their messages
+                dominant_user = mentioned_users[0]
+                logger.info(f"Detected single-user query for '{dominant_user}'. Retrieving ALL messages from this user.")
+                initial_contexts = await self._run_blocking(
+                    self.vector_store.search,
+                    question_embedding,
+                    top_k=500,  # Large number to get all messages from user
+                    filter_user_name=dominant_user,
+                )
+                logger.info(f"Retrieved {len(initial_contexts)} messages from {dominant_user}")
+            else:
+                # Multi-user query - retrieve ALL messages from ALL mentioned users
+                target_users = mentioned_users
+                logger.info(f"Detected multi-user query for {len(target_users)} users: {target_users}. Retrieving ALL messages from each user.")
+
+                # Collect messages from all mentioned users (in parallel - each is a network call)
+                per_user_contexts = await asyncio.gather(*[
+                    self._run_blocking(
+                        self.vector_store.search,
+                        question_embedding,
+                        top_k=500,  # Large number to get all messages from user
+                        filter_user_name=user_name,
+                    )
+                    for user_name in target_users
+                ])
+                all_user_contexts = []
+                for user_name, user_contexts in zip(target_users, per_user_contexts):
+                    all_user_contexts.extend(user_contexts)
+                    logger.info(f"Retrieved {len(user_contexts)} messages from {user_name}")
+
+                initial_contexts = all_user_contexts
+                logger.info(f"Total retrieved: {len(initial_contexts)} messages from {len(target_users)} users")
+        elif user_counts and is_user_specific_query:
+            # Fallback: if no explicit user names detected, check if one user dominates
+            sorted_users = sorted(user_counts.items(), key=lambda x: x[1], reverse=True)
+            top_user, top_count = sorted_users[0]
+            user_ratio = top_count / len(initial_contexts) if initial_contexts else 0
+            
+            # If one user dominates (>50% of results), retrieve ALL their messages
+            if user_ratio > 0.5:
+                dominant_user = top_user
+                logger.info(f"Detected user-specific query for '{dominant_user}' ({top_count}/{len(initial_contexts)} = {user_ratio:.1%}). Retrieving ALL messages from this user.")
+                initial_contexts = await self._run_blocking(
+                    self.vector_store.search,
+                    question_embedding,
+                    top_k=500,  # Large number to get all messages from user
+                    filter_user_name=dominant_user,
+                )
+                logger.info(f"Retrieved {len(initial_contexts)} messages from {dominant_user}")
+
+        for ctx in initial_contexts:
+            logger.debug(
+                f"  - [{ctx.message.user_name}] {ctx.message.message[:50]}... (score: {ctx.similarity_score:.4f})"
+            )
+
+        # Deduplicate by message id before reranking - merged multi-user
+        # searches can return the same message twice, and every duplicate
+        # costs a full cross-encoder forward pass
+        seen_ids = set()
+        deduped_contexts = []
+        for ctx in initial_contexts:
+            if ctx.message.id not in seen_ids:
+                seen_ids.add(ctx.message.id)
+                deduped_contexts.append(ctx)
+        if len(deduped_contexts) < len(initial_contexts):
+            logger.info(
+                f"Dropped {len(initial_contexts) - len(deduped_contexts)} duplicate messages before reranking"
+            )
+        initial_contexts = deduped_contexts
+
+        # Step 3: Rerank using cross-encoder
+        # Always rerank, then apply limit to get top-30 most relevant sources
+        # Reranking improves quality by better understanding query-context relevance
+
+        logger.info(f"[3/5] Reranking {len(initial_contexts)} messages with cross-encoder")
+
+        # Limit: use max_sources if specified, otherwise default to 30 for all queries.
+        # Passing top_k down lets the reranker partial-sort and only touch the
+        # contexts that are actually returned
+        top_k_after_rerank = request.max_sources if request.max_sources is not None else 30
+        reranked_contexts = await self._run_blocking(
+            self.reranker.rerank,
+            request.question, initial_contexts, top_k=top_k_after_rerank,
+        )
+        logger.info(f"Reranked to top-{top_k_after_rerank} most relevant messages (from {len(initial_contexts)} candidates)")
+
+        for ctx in reranked_contexts:
+            logger.debug(
+                f"  - [{ctx.message.user_name}] {ctx.message.message[:50]}... (reranker: {ctx.reranker_score:.4f})"
+            )
+
+        return reranked_contexts, mentioned_users
 
     async def answer_question(self, request: QuestionRequest) -> AnswerResponse:
         """
@@ -101,159 +364,13 @@ class QARetriever:
         start_time = time.time()
 
         try:
-            # Step 1: Embed question (pure semantic understanding - no regex/pattern matching)
-            logger.info("[1/5] Embedding question")
-            question_embedding = self.embeddings_client.embed_single(request.question)
-            logger.debug(f"Question embedding generated ({len(question_embedding)} dims)")
-
-            # Step 2: Retrieve initial candidates to detect user-specific queries
-            logger.info(f"[2/5] Retrieving top-{self.top_k_initial} messages for initial analysis")
-            initial_contexts = self.vector_store.search(
-                question_embedding, 
-                top_k=self.top_k_initial
-            )
-            logger.info(f"Retrieved {len(initial_contexts)} messages")
-            
-            # Analyze user distribution to detect user-specific queries
-            user_counts = {}
-            for ctx in initial_contexts:
-                user_name = ctx.message.user_name
-                user_counts[user_name] = user_counts.get(user_name, 0) + 1
-            logger.info(f"User distribution in top-{self.top_k_initial}: {dict(sorted(user_counts.items(), key=lambda x: x[1], reverse=True)[:10])}")
-
-            # Initialize user name cache on first query (lazy loading)
-            if not self._cache_initialized:
-                self._initialize_user_name_cache()
-            
-            # Detect if this is a user-specific or multi-user query
-            # Use SEMANTIC matching with CACHED embeddings (no embedding on each query!)
-            query_lower = request.question.lower()
-            mentioned_users = []
-            
-            # Use cached full name embeddings for semantic matching
-            # Semantic similarity naturally handles matching "Sophia" (query) to "Sophia Al-Farsi" (full name)
-            logger.debug(f"Checking {len(self._user_name_embeddings_cache)} cached full names for semantic match")
-            
-            query_emb_array = np.array(question_embedding)
-            
-            # Compare query with ALL cached full name embeddings
-            # The embedding model understands that "Sophia" semantically matches "Sophia Al-Farsi"
-            user_similarities = []
-            for user_name, name_emb in self._user_name_embeddings_cache.items():
-                name_emb_array = np.array(name_emb)
-                
-                # Cosine similarity
-                similarity = np.dot(query_emb_array, name_emb_array) / (
-                    np.linalg.norm(query_emb_array) * np.linalg.norm(name_emb_array)
-                )
-                
-                user_similarities.append((user_name, similarity))
-            
-            # Sort by similarity and use a dynamic threshold
-            # Take top-N users with highest similarity, but only if similarity is above a minimum threshold
-            user_similarities.sort(key=lambda x: x[1], reverse=True)
-            
-            # Dynamic threshold: Use top similarity as reference, accept users within 0.2 of top score
-            # This ensures we only get users that are actually mentioned, not all users
-            if user_similarities:
-                top_similarity = user_similarities[0][1]
-                # Threshold: Must be within 0.2 of top score AND above 0.5 absolute threshold
-                min_threshold = max(0.5, top_similarity - 0.2)
-                
-                for user_name, similarity in user_similarities:
-                    if similarity >= min_threshold:
-                        if user_name not in mentioned_users:
-                            mentioned_users.append(user_name)
-                            logger.debug(f"Semantically matched user '{user_name}' (similarity: {similarity:.3f}, threshold: {min_threshold:.3f})")
-                    else:
-                        # Stop once we're below threshold (sorted by similarity, so rest will be lower)
-                        break
-            
-            logger.info(f"Semantically detected {len(mentioned_users)} users in query: {mentioned_users}")
-            
-            # Check if query seems user-specific (contains words like "summarize", "messages", "said", etc.)
-            user_specific_keywords = ["summarize", "summarise", "messages", "said", "say", "request", "requests", "asked", "ask", "visited", "visit", "places", "travel"]
-            is_user_specific_query = any(keyword in query_lower for keyword in user_specific_keywords)
-            
-            dominant_user = None
-            target_users = []
-            
-            if mentioned_users and is_user_specific_query:
-                if len(mentioned_users) == 1:
-                    # Single user query - retrieve ALL their messages
-                    dominant_user = mentioned_users[0]
-                    logger.info(f"Detected single-user query for '{dominant_user}'. Retrieving ALL messages from this user.")
-                    initial_contexts = self.vector_store.search(
-                        question_embedding,
-                        top_k=500,  # Large number to get all messages from user
-                        filter_user_name=dominant_user
-                    )
-                    logger.info(f"Retrieved {len(initial_contexts)} messages from {dominant_user}")
-                else:
-                    # Multi-user query - retrieve ALL messages from ALL mentioned users
-                    target_users = mentioned_users
-                    logger.info(f"Detected multi-user query for {len(target_users)} users: {target_users}. Retrieving ALL messages from each user.")
-                    
-                    # Collect messages from all mentioned users
-                    all_user_contexts = []
-                    for user_name in target_users:
-                        user_contexts = self.vector_store.search(
-                            question_embedding,
-                            top_k=500,  # Large number to get all messages from user
-                            filter_user_name=user_name
-                        )
-                        all_user_contexts.extend(user_contexts)
-                        logger.info(f"Retrieved {len(user_contexts)} messages from {user_name}")
-                    
-                    initial_contexts = all_user_contexts
-                    logger.info(f"Total retrieved: {len(initial_contexts)} messages from {len(target_users)} users")
-            elif user_counts and is_user_specific_query:
-                # Fallback: if no explicit user names detected, check if one user dominates
-                sorted_users = sorted(user_counts.items(), key=lambda x: x[1], reverse=True)
-                top_user, top_count = sorted_users[0]
-                user_ratio = top_count / len(initial_contexts) if initial_contexts else 0
-                
-                # If one user dominates (>50% of results), retrieve ALL their messages
-                if user_ratio > 0.5:
-                    dominant_user = top_user
-                    logger.info(f"Detected user-specific query for '{dominant_user}' ({top_count}/{len(initial_contexts)} = {user_ratio:.1%}). Retrieving ALL messages from this user.")
-                    initial_contexts = self.vector_store.search(
-                        question_embedding,
-                        top_k=500,  # Large number to get all messages from user
-                        filter_user_name=dominant_user
-                    )
-                    logger.info(f"Retrieved {len(initial_contexts)} messages from {dominant_user}")
-
-            for ctx in initial_contexts:
-                logger.debug(
-                    f"  - [{ctx.message.user_name}] {ctx.message.message[:50]}... (score: {ctx.similarity_score:.4f})"
-                )
-
-            # Step 3: Rerank using cross-encoder
-            # Always rerank, then apply limit to get top-30 most relevant sources
-            # Reranking improves quality by better understanding query-context relevance
-            
-            logger.info(f"[3/5] Reranking {len(initial_contexts)} messages with cross-encoder")
-            
-            # Rerank all initial contexts (cross-encoder scores all query-message pairs)
-            reranked_all = self.reranker.rerank(
-                request.question, initial_contexts, top_k=None  # Rerank all, no limit yet
-            )
-            
-            # Apply limit: use max_sources if specified, otherwise default to 30 for all queries
-            top_k_after_rerank = request.max_sources if request.max_sources is not None else 30
-            reranked_contexts = reranked_all[:top_k_after_rerank]
-            logger.info(f"Reranked to top-{top_k_after_rerank} most relevant messages (from {len(reranked_all)} reranked)")
-
-            for ctx in reranked_contexts:
-                logger.debug(
-                    f"  - [{ctx.message.user_name}] {ctx.message.message[:50]}... (reranker: {ctx.reranker_score:.4f})"
-                )
+            # Steps 1-3: embed, retrieve, rerank (shared with the streaming path)
+            reranked_contexts, mentioned_users = await self._retrieve_contexts(request)
 
             # Step 4: Generate answer with LLM
             logger.info("[4/5] Generating answer with LLM")
-            answer_text, token_usage = self.llm_service.generate_answer(
-                request.question, reranked_contexts
+            answer_text, token_usage = await self._run_blocking(
+                self.llm_service.generate_answer, request.question, reranked_contexts
             )
             logger.info(f"Answer generated: {answer_text[:100]}...")
 
@@ -262,7 +379,7 @@ class QARetriever:
             if request.include_evaluations:
                 logger.info("[5/5] Running evaluations")
                 try:
-                    evaluations = self.evaluation_engine.evaluate(
+                    evaluations = await self.evaluation_engine.evaluate(
                         request.question, answer_text, reranked_contexts
                     )
                     logger.info(
@@ -349,6 +466,48 @@ class QARetriever:
             logger.error(f"Error in question answering: {e}", exc_info=True)
             raise
 
+    async def stream_answer(self, request: QuestionRequest):
+        """
+        Answer a question, yielding the answer text incrementally.
+
+        Retrieval runs exactly as in answer_question; the LLM call streams so
+        clients see the first tokens while the rest are still generating.
+
+        Args:
+            request: Question request
+
+        Yields:
+            Answer text chunks as they arrive from the LLM
+        """
+        logger.info("=" * 80)
+        logger.info(f"STREAMING ANSWER: {request.question}")
+        logger.info("=" * 80)
+
+        start_time = time.time()
+
+        try:
+            reranked_contexts, _ = await self._retrieve_contexts(request)
+
+            logger.info("[4/4] Streaming answer with LLM")
+            loop = asyncio.get_running_loop()
+            stream = self.llm_service.generate_answer_stream(request.question, reranked_contexts)
+            while True:
+                # Pull from the blocking generator on the executor so the
+                # event loop stays free between tokens
+                delta = await loop.run_in_executor(self._executor, next, stream, None)
+                if delta is None:
+                    break
+                yield delta
+
+            latency_ms = (time.time() - start_time) * 1000
+            logger.info("=" * 80)
+            logger.info(f"QUESTION STREAMED in {latency_ms:.1f}ms")
+            logger.info("=" * 80)
+
+        except Exception as e:
+            logger.error(f"Error in streaming answer: {e}", exc_info=True)
+            raise
+
 
 # Global retriever instance
 _retriever = None
@@ -1,12 +1,24 @@
 """Token counting and cost calculation utilities."""
 
 import logging
+from functools import lru_cache
 from typing import Optional, Dict
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _get_encoder():
+    """Get the cached tiktoken encoder (or None if tiktoken is unavailable)."""
+    try:
+        import tiktoken
+        return tiktoken.encoding_for_model("gpt-4o-mini")
+    except Exception as e:
+        logger.warning(f"tiktoken unavailable, falling back to character estimate: {e}")
+        return None
+
+
 @dataclass
 class TokenUsage:
     """Token usage information."""
@@ -19,20 +31,15 @@ class TokenUsage:
 class TokenUtils:
     """Utilities for token counting and cost calculation."""
     
-    # Pricing per 1M tokens (as of 2024)
-    # GPT-4o mini pricing via OpenRouter
+    # Pricing per token as flat (input, output) pairs (as of 2024)
+    # GPT-4o mini pricing via OpenRouter: $0.15 / $0.60 per 1M tokens
+    # Flat tuples keep calculate_cost to a single dict lookup + two multiplies,
+    # which matters because it runs on every /ask response
     MODEL_PRICING = {
-        "openai/gpt-4o-mini": {
-            "input": 0.15 / 1_000_000,  # $0.15 per 1M input tokens
-            "output": 0.60 / 1_000_000,  # $0.60 per 1M output tokens
-        },
-        # Default fallback pricing
-        "default": {
-            "input": 0.15 / 1_000_000,
-            "output": 0.60 / 1_000_000,
-        }
+        "openai/gpt-4o-mini": (0.15 / 1_000_000, 0.60 / 1_000_000),
     }
-    
+    DEFAULT_PRICING = (0.15 / 1_000_000, 0.60 / 1_000_000)
+
     @staticmethod
     def calculate_cost(
         prompt_tokens: int,
@@ -41,23 +48,17 @@ class TokenUtils:
     ) -> float:
         """
         Calculate cost in USD for token usage.
-        
+
         Args:
             prompt_tokens: Number of input/prompt tokens
             completion_tokens: Number of output/completion tokens
             model: Model name for pricing lookup
-        
+
         Returns:
-            Cost in USD
+            Cost in USD (unrounded - format_cost handles display)
         """
-        pricing = TokenUtils.MODEL_PRICING.get(model, TokenUtils.MODEL_PRICING["default"])
-        
-        input_cost = prompt_tokens * pricing["input"]
-        output_cost = completion_tokens * pricing["output"]
-        
-        total_cost = input_cost + output_cost
-        
-        return round(total_cost, 6)  # Round to 6 decimal places
+        input_price, output_price = TokenUtils.MODEL_PRICING.get(model, TokenUtils.DEFAULT_PRICING)
+        return prompt_tokens * input_price + completion_tokens * output_price
     
     @staticmethod
     def extract_usage_from_response(response) -> Optional[TokenUsage]:
@@ -118,17 +119,21 @@ class TokenUtils:
     @staticmethod
     def estimate_tokens(text: str) -> int:
         """
-        Estimate token count for a text string.
-        Rough approximation: ~4 characters per token for English text.
-        
+        Count tokens for a text string using the model's BPE tokenizer.
+        Falls back to a ~4 characters per token approximation if tiktoken
+        is not installed.
+
         Args:
             text: Text to estimate tokens for
-        
+
         Returns:
-            Estimated token count
+            Token count (exact with tiktoken, estimated otherwise)
         """
         if not text:
             return 0
+        encoder = _get_encoder()
+        if encoder is not None:
+            return len(encoder.encode(text, disallowed_special=()))
         # Rough approximation: 1 token ≈ 4 characters for English
         return len(text) // 4
     
@@ -1,8 +1,16 @@
 """Pinecone vector store integration."""
 
+import copy
+import hashlib
 import logging
+import random
+import threading
 import time
-from typing import List, Tuple, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import ClassVar, List, Tuple, Optional, Union
+import numpy as np
 from pinecone import Pinecone
 from .models import Message, RetrievedContext
 from .config import get_settings
@@ -13,129 +21,376 @@ logger = logging.getLogger(__name__)
 class PineconeStore:
     """Vector store using Pinecone."""
 
+    # Fixed by the embedding model - a class constant, not per-instance state
+    EMBEDDING_DIM: ClassVar[int] = 1024
+
     def __init__(self):
         """Initialize Pinecone client and index."""
         settings = get_settings()
 
-        logger.info(f"Initializing Pinecone with index: {settings.pinecone_index_name}")
+        logger.info("Initializing Pinecone with index: %s", settings.pinecone_index_name)
 
         try:
             self.client = Pinecone(api_key=settings.pinecone_api_key)
             self.index_name = settings.pinecone_index_name
-            self.embedding_dim = 1024  # Jina v3 dimension
+            self.quantize_vectors = settings.quantize_vectors
+            self.pool_threads = settings.pinecone_pool_threads
 
             # Try to access the index directly (it should already exist)
-            logger.info(f"Accessing index '{self.index_name}'...")
+            logger.info("Accessing index '%s'...", self.index_name)
             try:
-                self.index = self.client.Index(self.index_name)
+                # pool_threads sizes the SDK's connection pool so async_req
+                # upserts and concurrent queries run in parallel over keep-alive
+                # connections
+                self.index = self.client.Index(self.index_name, pool_threads=self.pool_threads)
                 # Test access by getting stats
                 stats = self.index.describe_index_stats()
-                logger.info(f"Successfully connected to index '{self.index_name}'")
-                logger.info(f"Index stats: {stats}")
+                logger.info("Successfully connected to index '%s'", self.index_name)
+                # Stats objects are large - skip formatting when INFO is off
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("Index stats: %s", stats)
             except Exception as e:
                 error_str = str(e).lower()
                 if "not found" in error_str or "404" in error_str:
                     # Index doesn't exist, try to create it
-                    logger.info(f"Index '{self.index_name}' not found. Attempting to create...")
+                    logger.info("Index '%s' not found. Attempting to create...", self.index_name)
                     try:
                         self.client.create_index(
                             name=self.index_name,
-                            dimension=self.embedding_dim,
+                            dimension=self.EMBEDDING_DIM,
                             metric="cosine",
                         )
-                        logger.info(f"Successfully created index '{self.index_name}'")
-                        # Wait for index to be ready
+                        logger.info("Successfully created index '%s'", self.index_name)
+                        # Wait for index to be ready - exponential backoff with
+                        # jitter (capped at 4s) detects fast provisioning in
+                        # well under the old fixed 3s poll interval
                         logger.info("Waiting for index to be ready...")
-                        max_wait = 60
-                        wait_time = 0
-                        while wait_time < max_wait:
+                        waited = 0.0
+                        for attempt in range(20):
+                            delay = min(0.5 * (2 ** attempt) + random.random() * 0.3, 4.0)
+                            time.sleep(delay)
+                            waited += delay
                             try:
-                                time.sleep(3)
-                                wait_time += 3
-                                test_index = self.client.Index(self.index_name)
-                                test_index.describe_index_stats()
-                                logger.info(f"Index is ready after {wait_time} seconds")
-                                self.index = test_index
-                                break
+                                # Lighter readiness probe than pulling full index stats
+                                description = self.client.describe_index(self.index_name)
+                                if description.status["ready"]:
+                                    self.index = self.client.Index(
+                                        self.index_name, pool_threads=self.pool_threads
+                                    )
+                                    logger.info("Index is ready after %.1f seconds", waited)
+                                    break
                             except Exception:
-                                if wait_time >= max_wait:
-                                    raise
                                 continue
+                        else:
+                            raise TimeoutError(
+                                f"Index '{self.index_name}' not ready after {waited:.1f}s"
+                            )
                     except Exception as create_error:
-                        logger.error(f"Failed to create index: {create_error}")
+                        logger.error("Failed to create index: %s", create_error)
                         raise
                 else:
-                    logger.error(f"Failed to access index '{self.index_name}': {e}")
+                    logger.error("Failed to access index '%s': %s", self.index_name, e)
                     logger.error("Please ensure:")
-                    logger.error(f"  1. Index '{self.index_name}' exists in Pinecone")
-                    logger.error(f"  2. Index has dimension {self.embedding_dim}")
-                    logger.error(f"  3. Pinecone API key has correct permissions")
+                    logger.error("  1. Index '%s' exists in Pinecone", self.index_name)
+                    logger.error("  2. Index has dimension %s", self.EMBEDDING_DIM)
+                    logger.error("  3. Pinecone API key has correct permissions")
                     raise
 
         except Exception as e:
-            logger.error(f"Failed to initialize Pinecone: {e}")
+            logger.error("Failed to initialize Pinecone: %s", e)
             raise
 
+        # Two-tier search cache. The exact tier is an LRU keyed on the query
+        # embedding bytes plus search parameters; the semantic tier keeps the
+        # most recent queries and reuses results when cosine similarity is
+        # near-identical (catches "Fatima" vs "Fatimah"-style repeats).
+        # Hits skip a network round trip and the per-query Pinecone cost.
+        self._search_cache = OrderedDict()
+        self._search_cache_lock = threading.Lock()
+        self._search_cache_max = 256
+        self._semantic_cache = []  # (unit embedding, top_k, filter, exact-tier key)
+        self._semantic_cache_max = 64
+        self._semantic_threshold = 0.97
+
+        # Short-TTL stats cache: health checks poll get_index_stats, and stats
+        # change slowly - coalesce bursty polling into one RTT per window
+        self._stats_cache = (0.0, None)  # (monotonic timestamp, stats)
+        self._stats_cache_ttl = 5.0
+        self._stats_cache_lock = threading.Lock()
+
+        # Shared query pool: concurrent search() callers run their Pinecone
+        # calls through one executor, so bursts of queries share keep-alive
+        # connections instead of each paying TLS/HTTP setup
+        self._query_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="pinecone-query")
+
+        # Pre-warm the connection pool: parallel no-op stats calls force the
+        # SDK to open keep-alive connections now, so the first real query
+        # doesn't pay TCP/TLS handshake cost
+        try:
+            with ThreadPoolExecutor(
+                max_workers=self.pool_threads, thread_name_prefix="pinecone-warm"
+            ) as warm_pool:
+                warm_futures = [
+                    warm_pool.submit(self.index.describe_index_stats)
+                    for _ in range(self.pool_threads)
+                ]
+                for future in warm_futures:
+                    future.result()
+            logger.info("Warmed %s Pinecone connections", self.pool_threads)
+        except Exception as e:
+            logger.warning("Connection pool warmup failed: %s", e)
+
+    def _invalidate_caches(self) -> None:
+        """
+        Flush the search and stats caches.
+
+        Called before any index mutation (upsert, delete) - cached results
+        would otherwise serve stale contexts for the rest of the process
+        lifetime after a reindex or refresh changes the underlying vectors.
+        """
+        with self._search_cache_lock:
+            self._search_cache.clear()
+            self._semantic_cache.clear()
+        with self._stats_cache_lock:
+            self._stats_cache = (0.0, None)
+        logger.debug("Search and stats caches invalidated")
+
+    @staticmethod
+    def _quantize(vector: np.ndarray) -> Tuple[List[float], float]:
+        """
+        Scalar-quantize a vector to int8 levels.
+
+        Values are snapped to 255 integer levels (symmetric, per-vector
+        scale), which serializes far smaller than full-precision floats.
+        The index metric is cosine, so the uniform scaling doesn't change
+        rankings; the scale is kept alongside for dequantization.
+
+        Args:
+            vector: float32 embedding vector
+
+        Returns:
+            Tuple of (quantized values as floats, per-vector scale)
+        """
+        vector = np.asarray(vector, dtype=np.float32)
+        scale = float(np.max(np.abs(vector))) / 127.0
+        if scale == 0.0:
+            return vector.tolist(), 1.0
+        quantized = np.clip(np.round(vector / scale), -127, 127)
+        # Pinecone dense vectors are float-typed, so ship the int8 levels as
+        # (small, short-to-serialize) floats rather than raw bytes
+        return quantized.tolist(), scale
+
     def upsert_embeddings(
         self,
         messages: List[Message],
-        embeddings: List[List[float]],
+        embeddings: Union[np.ndarray, List[List[float]]],
     ) -> int:
         """
         Upsert messages with their embeddings to Pinecone.
 
         Args:
             messages: List of message objects
-            embeddings: List of embedding vectors
+            embeddings: (N, dim) ndarray or list of embedding vectors - ndarray
+                rows are converted one at a time inside the vector generator,
+                never as a whole-matrix tolist()
 
         Returns:
             Number of vectors upserted
         """
         if len(messages) != len(embeddings):
-            logger.error(f"Mismatch: {len(messages)} messages, {len(embeddings)} embeddings")
+            logger.error("Mismatch: %s messages, %s embeddings", len(messages), len(embeddings))
             raise ValueError("Messages and embeddings count mismatch")
 
-        logger.info(f"Upserting {len(messages)} vectors to Pinecone")
+        logger.info("Upserting %s vectors to Pinecone", len(messages))
+
+        # The index is about to change - drop cached results before writing so
+        # a concurrent reindex can't keep serving pre-upsert contexts
+        self._invalidate_caches()
 
         try:
-            # Prepare vectors for upsert
-            vectors_to_upsert = []
-            for msg, emb in zip(messages, embeddings):
-                vector = (
-                    msg.id,
-                    emb,
-                    {
+            # Build vectors lazily - materializing the whole list up front
+            # costs O(N) memory (hundreds of MB on large ingests), while the
+            # generator keeps peak memory at the in-flight batches only.
+            # Rows convert to lists one at a time, and the dict format is what
+            # the SDK uses internally, avoiding a tuple->dict rebuild.
+            def vector_stream():
+                for msg, emb in zip(messages, embeddings):
+                    metadata = {
                         "user_id": msg.user_id,
                         "user_name": msg.user_name,
                         "timestamp": msg.timestamp,
                         "message": msg.message,
-                    },
+                    }
+                    if self.quantize_vectors:
+                        values, scale = self._quantize(emb)
+                        metadata["quant_scale"] = scale
+                    else:
+                        values = emb.tolist() if isinstance(emb, np.ndarray) else emb
+                    yield {"id": msg.id, "values": values, "metadata": metadata}
+
+            # Chunk into 100-vector batches (Pinecone's per-request limit) and
+            # fire them with async_req=True so the SDK's connection pool runs
+            # them in parallel. Cap in-flight batches to bound memory.
+            batch_size = 100
+            max_in_flight = self.pool_threads  # one in-flight batch per pooled connection
+            stream = vector_stream()
+
+            upserted_count = 0
+            batch_num = 0
+            in_flight = []  # (batch_num, batch, async_result)
+
+            while True:
+                batch = list(islice(stream, batch_size))
+                if not batch:
+                    break
+                batch_num += 1
+                in_flight.append(
+                    (batch_num, batch, self.index.upsert(vectors=batch, async_req=True))
                 )
-                vectors_to_upsert.append(vector)
+                if len(in_flight) >= max_in_flight:
+                    num, pending_batch, async_result = in_flight.pop(0)
+                    upserted_count += self._resolve_upsert(pending_batch, async_result, num)
 
-            # Upsert to Pinecone
-            upsert_response = self.index.upsert(vectors=vectors_to_upsert)
-            
-            # Extract the count from the response (Pinecone returns a dict-like object)
-            if isinstance(upsert_response, dict):
-                upserted_count = upsert_response.get('upserted_count', len(messages))
-            elif hasattr(upsert_response, 'upserted_count'):
-                upserted_count = upsert_response.upserted_count
-            else:
-                # Fallback: assume all were upserted
-                upserted_count = len(messages)
-            
-            logger.info(f"Successfully upserted {upserted_count} vectors")
+            for num, pending_batch, async_result in in_flight:
+                upserted_count += self._resolve_upsert(pending_batch, async_result, num)
+
+            logger.info("Successfully upserted %s vectors (%s batches)", upserted_count, batch_num)
 
             return upserted_count
 
         except Exception as e:
-            logger.error(f"Failed to upsert embeddings: {e}")
+            logger.error("Failed to upsert embeddings: %s", e)
             raise
 
+    def _resolve_upsert(self, batch, async_result, batch_num: int, max_attempts: int = 5) -> int:
+        """
+        Resolve one async upsert batch, retrying failures with backoff.
+
+        A transient failure on one batch is retried synchronously with
+        exponential backoff instead of aborting the whole load.
+
+        Args:
+            batch: The vectors in this batch (used for retries)
+            async_result: The in-flight async result from the initial upsert
+            batch_num: 1-based batch number for logging
+            max_attempts: Total attempts before giving up
+
+        Returns:
+            Number of vectors upserted for this batch
+        """
+        for attempt in range(max_attempts):
+            try:
+                if async_result is not None:
+                    upsert_response = async_result.get()
+                else:
+                    upsert_response = self.index.upsert(vectors=batch)
+
+                # Duck-typed count extraction: attribute first, dict key next,
+                # otherwise assume the whole batch landed
+                count = getattr(upsert_response, "upserted_count", None)
+                if count is None and isinstance(upsert_response, dict):
+                    count = upsert_response.get("upserted_count")
+                return count if count is not None else len(batch)
+
+            except Exception as e:
+                async_result = None  # Retries go through the synchronous path
+                if attempt == max_attempts - 1:
+                    logger.error("Upsert batch %s failed after %s attempts: %s", batch_num, max_attempts, e)
+                    raise
+                delay = min(0.5 * (2 ** attempt), 8.0)
+                logger.warning(
+                    "Upsert batch %s failed (attempt %s/%s), retrying in %.1fs: %s",
+                    batch_num, attempt + 1, max_attempts, delay, e,
+                )
+                time.sleep(delay)
+
+    def _submit_query(self, query_params: dict):
+        """Run a query on the shared pool and wait for its result."""
+        return self._query_pool.submit(self.index.query, **query_params).result(timeout=60)
+
+    @staticmethod
+    def _copy_results(results: List[RetrievedContext]) -> List[RetrievedContext]:
+        """Deep-copy cached results - downstream stages mutate contexts in place."""
+        return copy.deepcopy(results)
+
+    def _cached_search(
+        self,
+        query_array: np.ndarray,
+        top_k: int,
+        filter_user_name: Optional[str],
+    ) -> Optional[List[RetrievedContext]]:
+        """
+        Look up a query in the two-tier cache.
+
+        Args:
+            query_array: Query embedding as a float32 ndarray
+            top_k: Number of results requested
+            filter_user_name: Optional user name filter
+
+        Returns:
+            Deep-copied cached results, or None on a miss
+        """
+        key = (
+            hashlib.blake2b(query_array.tobytes(), digest_size=16).digest(),
+            top_k,
+            filter_user_name,
+        )
+
+        with self._search_cache_lock:
+            cached = self._search_cache.get(key)
+            if cached is not None:
+                self._search_cache.move_to_end(key)
+                logger.info("Search cache hit (exact) for top_k=%s", top_k)
+                return self._copy_results(cached)
+
+            # Semantic tier: reuse results for near-identical query vectors
+            # with the same search parameters
+            norm = np.linalg.norm(query_array)
+            if norm > 0:
+                unit = query_array / norm
+                for cached_unit, cached_top_k, cached_filter, cached_key in self._semantic_cache:
+                    if cached_top_k != top_k or cached_filter != filter_user_name:
+                        continue
+                    similarity = float(cached_unit @ unit)
+                    if similarity >= self._semantic_threshold:
+                        cached = self._search_cache.get(cached_key)
+                        if cached is not None:
+                            self._search_cache.move_to_end(cached_key)
+                            logger.info(
+                                "Search cache hit (semantic, cos=%.3f) for top_k=%s", similarity, top_k
+                            )
+                            return self._copy_results(cached)
+
+        return None
+
+    def _store_search_result(
+        self,
+        query_array: np.ndarray,
+        top_k: int,
+        filter_user_name: Optional[str],
+        results: List[RetrievedContext],
+    ) -> None:
+        """Store a search result in both cache tiers."""
+        key = (
+            hashlib.blake2b(query_array.tobytes(), digest_size=16).digest(),
+            top_k,
+            filter_user_name,
+        )
+        norm = np.linalg.norm(query_array)
+        unit = query_array / norm if norm > 0 else query_array
+
+        with self._search_cache_lock:
+            self._search_cache[key] = self._copy_results(results)
+            while len(self._search_cache) > self._search_cache_max:
+                self._search_cache.popitem(last=False)
+
+            self._semantic_cache.append((unit, top_k, filter_user_name, key))
+            if len(self._semantic_cache) > self._semantic_cache_max:
+                self._semantic_cache.pop(0)
+
     def search(
         self,
-        query_embedding: List[float],
+        query_embedding: Union[np.ndarray, List[float]],
         top_k: int = 5,
         filter_user_name: Optional[str] = None,
     ) -> List[RetrievedContext]:
@@ -143,16 +398,31 @@ class PineconeStore:
         Search for most similar messages.
 
         Args:
-            query_embedding: Query embedding vector
+            query_embedding: Query embedding vector (ndarray stays unboxed
+                until the SDK boundary)
             top_k: Number of top results to return
             filter_user_name: Optional user name to filter by (exact match)
 
         Returns:
             List of retrieved contexts with scores
         """
-        logger.debug(f"Searching Pinecone with top_k={top_k}, filter_user_name={filter_user_name}")
+        logger.debug("Searching Pinecone with top_k=%s, filter_user_name=%s", top_k, filter_user_name)
 
         try:
+            query_array = np.asarray(query_embedding, dtype=np.float32)
+
+            cached = self._cached_search(query_array, top_k, filter_user_name)
+            if cached is not None:
+                return cached
+
+            # Convert to a plain list only at the SDK boundary - upstream
+            # callers now pass numpy arrays straight through. When the index
+            # holds quantized vectors, quantize the query the same way.
+            if self.quantize_vectors:
+                query_embedding, _ = self._quantize(query_array)
+            elif isinstance(query_embedding, np.ndarray):
+                query_embedding = query_embedding.tolist()
+
             # Build query parameters
             query_params = {
                 "vector": query_embedding,
@@ -163,12 +433,15 @@ class PineconeStore:
             # Add metadata filter if user_name is specified
             if filter_user_name:
                 query_params["filter"] = {"user_name": {"$eq": filter_user_name}}
-                logger.debug(f"Filtering by user_name: {filter_user_name}")
+                logger.debug("Filtering by user_name: %s", filter_user_name)
             
-            results = self.index.query(**query_params)
+            results = self._submit_query(query_params)
 
-            retrieved = []
-            for i, match in enumerate(results.get("matches", [])):
+            # Pre-size the result list - the match count is known, so
+            # index-assignment avoids append's incremental resizes
+            matches = results.get("matches", [])
+            retrieved = [None] * len(matches)
+            for i, match in enumerate(matches):
                 msg_data = match.get("metadata", {})
                 message = Message(
                     id=match["id"],
@@ -178,56 +451,100 @@ class PineconeStore:
                     message=msg_data.get("message", ""),
                 )
 
-                context = RetrievedContext(
+                retrieved[i] = RetrievedContext(
                     message=message,
                     similarity_score=match.get("score", 0),
                     rank=i + 1,
                 )
-                retrieved.append(context)
 
-            logger.info(f"Retrieved {len(retrieved)} results from Pinecone")
+            logger.info("Retrieved %s results from Pinecone", len(retrieved))
+            self._store_search_result(query_array, top_k, filter_user_name, retrieved)
             return retrieved
 
         except Exception as e:
-            logger.error(f"Search failed: {e}")
+            logger.error("Search failed: %s", e)
             raise
 
     def get_index_stats(self) -> dict:
         """
-        Get index statistics.
+        Get index statistics (cached for a few seconds).
 
         Returns:
             Dictionary with index stats
         """
         try:
+            now = time.monotonic()
+            with self._stats_cache_lock:
+                cached_at, cached_stats = self._stats_cache
+                if cached_stats is not None and now - cached_at < self._stats_cache_ttl:
+                    logger.debug("Index stats cache hit")
+                    return cached_stats
+
             stats = self.index.describe_index_stats()
-            logger.debug(f"Index stats: {stats}")
+            logger.debug("Index stats: %s", stats)
+
+            with self._stats_cache_lock:
+                self._stats_cache = (now, stats)
             return stats
         except Exception as e:
-            logger.error(f"Failed to get index stats: {e}")
+            logger.error("Failed to get index stats: %s", e)
             raise
 
-    def delete_all(self) -> None:
-        """Delete all vectors from index."""
-        logger.warning("Deleting all vectors from Pinecone index")
+    def delete(
+        self,
+        namespace: Optional[str] = None,
+        filter: Optional[dict] = None,
+        all: bool = False,
+    ) -> None:
+        """
+        Delete vectors from the index, scoped as narrowly as possible.
+
+        A full delete_all forces Pinecone to rebuild the whole index; for
+        incremental refreshes (e.g. one user's messages) a metadata filter or
+        namespace delete is far cheaper server-side.
+
+        Args:
+            namespace: Delete everything within this namespace only
+            filter: Metadata filter, e.g. {"user_name": {"$eq": "..."}}
+            all: Delete every vector in the index
+        """
+        self._invalidate_caches()
         try:
-            # Delete by deleting namespace (or all if no namespace)
-            self.index.delete(delete_all=True)
-            logger.info("Successfully deleted all vectors")
+            if all:
+                logger.warning("Deleting all vectors from Pinecone index")
+                self.index.delete(delete_all=True)
+                logger.info("Successfully deleted all vectors")
+            elif namespace is not None:
+                logger.info("Deleting all vectors in namespace '%s'", namespace)
+                self.index.delete(delete_all=True, namespace=namespace)
+                logger.info("Successfully deleted namespace '%s'", namespace)
+            elif filter is not None:
+                logger.info("Deleting vectors matching filter: %s", filter)
+                self.index.delete(filter=filter)
+                logger.info("Successfully deleted filtered vectors")
+            else:
+                raise ValueError("delete() requires namespace, filter, or all=True")
         except Exception as e:
-            logger.error(f"Failed to delete all vectors: {e}")
+            logger.error("Failed to delete vectors: %s", e)
             raise
 
+    def delete_all(self) -> None:
+        """Delete all vectors from index."""
+        self.delete(all=True)
+
 
 # Global store instance
 _vector_store = None
+_vector_store_lock = threading.Lock()
 
 
 def get_vector_store() -> PineconeStore:
-    """Get or create the vector store."""
+    """Get or create the vector store (thread-safe)."""
     global _vector_store
     if _vector_store is None:
-        logger.info("Creating new PineconeStore instance")
-        _vector_store = PineconeStore()
+        with _vector_store_lock:
+            if _vector_store is None:
+                logger.info("Creating new PineconeStore instance")
+                _vector_store = PineconeStore()
     return _vector_store
 
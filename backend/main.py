@@ -7,6 +7,7 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
 from app.config import get_settings
 from app.logger_config import setup_logging
@@ -69,6 +70,32 @@ async def lifespan(app: FastAPI):
         app_state["retriever"] = retriever
         logger.info("Retriever initialized successfully")
 
+        # Warm up the reranker in the background so the first /ask doesn't
+        # pay the model-load + kernel-caching cost (multi-hundred-ms spike)
+        def warmup_reranker():
+            try:
+                from app.models import Message, RetrievedContext
+                from app.reranker import get_reranker
+
+                dummy_context = RetrievedContext(
+                    message=Message(
+                        id="warmup",
+                        user_id="warmup",
+                        user_name="warmup",
+                        timestamp="",
+                        message="warmup message",
+                    ),
+                    similarity_score=0.0,
+                    rank=1,
+                )
+                get_reranker().rerank("warmup", [dummy_context], top_k=1)
+                logger.info("Reranker warmup complete")
+            except Exception as e:
+                logger.warning(f"Reranker warmup failed: {e}")
+
+        loop = asyncio.get_running_loop()
+        app_state["reranker_warmup"] = loop.run_in_executor(None, warmup_reranker)
+
         # Check Pinecone for existing indexed data and populate indexing state
         try:
             from app.vector_store import get_vector_store
@@ -127,11 +154,15 @@ async def lifespan(app: FastAPI):
 
 
 # Create FastAPI app
+# ORJSONResponse serializes responses with orjson (native code), which is
+# noticeably faster than the default JSONResponse on /ask payloads that
+# carry retrieved sources and evaluations
 app = FastAPI(
     title="Aurora QA System",
     description="Question-answering system for member data using RAG",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware
@@ -197,6 +228,46 @@ async def ask(request: QuestionRequest) -> AnswerResponse:
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@app.post("/ask/stream")
+@optional_instrument("ask_stream_endpoint")
+async def ask_stream(request: QuestionRequest) -> StreamingResponse:
+    """
+    Ask a question and stream the answer text as it is generated.
+
+    Retrieval runs in full before generation; only the LLM output streams,
+    so the first tokens arrive as soon as the model produces them instead
+    of after the whole completion finishes.
+
+    Args:
+        request: Question request
+
+    Returns:
+        Plain-text streaming response with the answer
+    """
+    logger.info(f"POST /ask/stream - Question: {request.question[:50]}...")
+
+    # Validate question
+    if not request.question or len(request.question.strip()) == 0:
+        logger.warning("Empty question received")
+        raise HTTPException(status_code=400, detail="Question cannot be empty")
+
+    # Check if indexing is complete
+    state = get_indexing_state()
+    if not state["in_progress"] and state["indexed_messages"] == 0:
+        logger.warning("Indexing not complete")
+        raise HTTPException(
+            status_code=503,
+            detail="Indexing in progress. Please retry in a few seconds.",
+        )
+
+    retriever = app_state.get("retriever")
+    if not retriever:
+        logger.error("Retriever not initialized")
+        raise HTTPException(status_code=500, detail="System not ready")
+
+    return StreamingResponse(retriever.stream_answer(request), media_type="text/plain")
+
+
 @app.get("/health", response_model=HealthResponse)
 @optional_instrument("health_endpoint")
 async def health() -> HealthResponse:
@@ -354,5 +425,13 @@ if __name__ == "__main__":
     import uvicorn
 
     logger.info("Starting uvicorn server")
-    uvicorn.run(app, host="0.0.0.0", port=8080, log_level=settings.log_level.lower())
+    # uvloop + httptools cut per-request event-loop and HTTP-parsing overhead
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8080,
+        log_level=settings.log_level.lower(),
+        loop="uvloop",
+        http="httptools",
+    )
 
@@ -8,11 +8,23 @@ Usage:
 """
 
 import sys
-import json
 import argparse
+import orjson
 import requests
+from requests.adapters import HTTPAdapter, Retry
 from typing import Optional
 
+# Persistent session with connection pooling - scripted runs that issue many
+# queries reuse one TCP/TLS connection instead of paying the handshake per call
+_SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.1),
+)
+_SESSION.mount("http://", _adapter)
+_SESSION.mount("https://", _adapter)
+
 
 def query_aurora(
     question: str,
@@ -44,9 +56,43 @@ def query_aurora(
         payload["max_sources"] = max_sources
     
     try:
-        response = requests.post(url, json=payload, timeout=60)
+        response = _SESSION.post(url, json=payload, timeout=60)
         response.raise_for_status()
-        return response.json()
+        # orjson decodes large --sources/--evaluations payloads several times
+        # faster than the stdlib json used by response.json()
+        return orjson.loads(response.content)
+    except requests.exceptions.RequestException as e:
+        print(f"Error querying API: {e}", file=sys.stderr)
+        if hasattr(e, 'response') and e.response is not None:
+            print(f"Response: {e.response.text}", file=sys.stderr)
+        sys.exit(1)
+
+
+def stream_aurora(
+    question: str,
+    base_url: str = "http://localhost:8000",
+    max_sources: Optional[int] = None,
+) -> None:
+    """
+    Query the Aurora QA System and print the answer as it streams.
+
+    Args:
+        question: The question to ask
+        base_url: Base URL of the Aurora API
+        max_sources: Maximum number of sources to use
+    """
+    url = f"{base_url}/ask/stream"
+    payload = {"question": question}
+    if max_sources is not None:
+        payload["max_sources"] = max_sources
+
+    try:
+        with _SESSION.post(url, json=payload, timeout=60, stream=True) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size=None, decode_unicode=True):
+                if chunk:
+                    print(chunk, end="", flush=True)
+        print()
     except requests.exceptions.RequestException as e:
         print(f"Error querying API: {e}", file=sys.stderr)
         if hasattr(e, 'response') and e.response is not None:
@@ -195,6 +241,11 @@ Examples:
         action="store_true",
         help="Output raw JSON instead of formatted text"
     )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream the answer text as it is generated (no sources/evaluations)"
+    )
     parser.add_argument(
         "--max-sources",
         type=int,
@@ -218,6 +269,15 @@ Examples:
         print("Error: Question cannot be empty", file=sys.stderr)
         sys.exit(1)
     
+    # Stream mode: print answer tokens as they arrive, then exit
+    if args.stream:
+        stream_aurora(
+            question=question,
+            base_url=args.url,
+            max_sources=args.max_sources,
+        )
+        return
+
     # Query the API
     response = query_aurora(
         question=question,
@@ -229,7 +289,10 @@ Examples:
     
     # Output results
     if args.json:
-        print(json.dumps(response, indent=2))
+        # Write orjson's bytes straight to the stdout buffer - skips the
+        # decode-to-str plus re-encode roundtrip print() would do
+        sys.stdout.buffer.write(orjson.dumps(response, option=orjson.OPT_INDENT_2))
+        sys.stdout.buffer.write(b"\n")
     else:
         print(format_response(response, verbose=args.verbose))
 
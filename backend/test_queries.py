@@ -6,9 +6,10 @@ Usage:
     python test_queries.py
 """
 
-import subprocess
-import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from query import query_aurora
 
 # Test queries - no hardcoded expectations, just test semantic understanding
 TEST_QUERIES = [
@@ -25,18 +26,12 @@ TEST_QUERIES = [
 ]
 
 def run_query(query: str) -> dict:
-    """Run a query and return the response."""
+    """Run a query in-process and return the response."""
     try:
-        result = subprocess.run(
-            ["python", "query.py", query, "--sources", "--json"],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-        if result.returncode != 0:
-            print(f"Error running query: {result.stderr}", file=sys.stderr)
-            return None
-        return json.loads(result.stdout)
+        return query_aurora(query, include_sources=True)
+    except SystemExit:
+        # query_aurora exits on request errors; treat as a failed query here
+        return None
     except Exception as e:
         print(f"Exception running query: {e}", file=sys.stderr)
         return None
@@ -47,12 +42,17 @@ def main():
     print("TESTING QUERIES")
     print("=" * 80)
     print()
-    
-    for i, query in enumerate(TEST_QUERIES, 1):
+
+    # Queries are I/O-bound (Pinecone + LLM on the server side), so issue
+    # them concurrently in-process instead of serial query.py subprocesses -
+    # no per-query interpreter startup, and total time is roughly the
+    # slowest query instead of the sum
+    with ThreadPoolExecutor(max_workers=len(TEST_QUERIES)) as pool:
+        responses = list(pool.map(run_query, TEST_QUERIES))
+
+    for i, (query, response) in enumerate(zip(TEST_QUERIES, responses), 1):
         print(f"[{i}/{len(TEST_QUERIES)}] Query: {query}")
-        
-        response = run_query(query)
-        
+
         if not response:
             print(f"  FAILED: Could not get response")
             print()
@@ -60,10 +60,11 @@ def main():
         
         answer = response.get("answer", "")
         sources = response.get("sources", [])
-        sources_users = [s.get("user_name") for s in sources]
-        
+        # Single pass, no intermediate list - dedup while preserving order
+        sources_users = dict.fromkeys(s.get("user_name") for s in sources)
+
         print(f"  Answer: {answer[:150]}...")
-        print(f"  Sources ({len(sources)}): {', '.join(set(sources_users))}")
+        print(f"  Sources ({len(sources)}): {', '.join(sources_users)}")
         print()
     
     print("=" * 80)